@@ -8,6 +8,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Agent switch marker: {"agent": "slug_name"} with flexible whitespace
+AGENT_JSON_RE = re.compile(r'{\s*"agent"\s*:\s*"([^"]+)"\s*}')
+# Literal every marker contains - a cheap substring test before the regex
+AGENT_KEY = '"agent"'
+
 
 def extract_agent_slug(text: str) -> Optional[str]:
     """
@@ -15,8 +20,10 @@ def extract_agent_slug(text: str) -> Optional[str]:
     Looking for pattern: {"agent": "slug_name"}
     """
     try:
+        if AGENT_KEY not in text:
+            return None
         # Match JSON with flexible whitespace
-        match = re.search(r'{\s*"agent"\s*:\s*"([^"]+)"\s*}', text)
+        match = AGENT_JSON_RE.search(text)
         if match:
             agent_slug = match.group(1)
             logger.info(f"Found agent switch request: {agent_slug}")
@@ -33,8 +40,10 @@ def remove_agent_json(text: str) -> str:
     Returns clean text without JSON markers
     """
     try:
+        if AGENT_KEY not in text:
+            return text
         # Remove all agent JSON patterns, preserving original spacing
-        clean_text = re.sub(r'{\s*"agent"\s*:\s*"[^"]+"\s*}', '', text)
+        clean_text = AGENT_JSON_RE.sub('', text)
         # Don't modify spacing - just return the text without JSON
         return clean_text
     except Exception as e:
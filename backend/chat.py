@@ -22,6 +22,17 @@ logger = logging.getLogger(__name__)
 # Router
 chat_router = APIRouter()
 
+# Agents the fallback classifier is allowed to switch to
+SWITCHABLE_AGENTS = frozenset({
+    "emotional_vomit", "solution_finder", "conflict_solver",
+    "communication_simulator", "misunderstanding_protector",
+    "relationship_upgrader", "breakthrough_manager"
+})
+
+# Strong references to fire-and-forget tasks - the event loop only keeps
+# weak ones, so an unreferenced task can be garbage collected mid-flight
+_background_tasks = set()
+
 # Test endpoint for agent switching
 @chat_router.get("/test-switch")
 async def test_agent_switch():
@@ -120,11 +131,7 @@ Reply with just the slug or "no"."""
         )
         
         result = response.choices[0].message.content.strip().lower()
-        if result != "no" and result in [
-            "emotional_vomit", "solution_finder", "conflict_solver",
-            "communication_simulator", "misunderstanding_protector",
-            "relationship_upgrader", "breakthrough_manager"
-        ]:
+        if result in SWITCHABLE_AGENTS:
             logger.info(f"Fallback switch to: {result}")
             return result
         return None
@@ -245,13 +252,15 @@ async def stream_chat(
                 logger.info(f"[CHAT] Scheduling memory save for user: {user_id}")
                 # Fire and forget pattern - save memory without blocking response
                 # This removes ~1-2 second delay from Mem0 API call
-                asyncio.create_task(add_memory(
+                task = asyncio.create_task(add_memory(
                     messages=[
                         {"role": "user", "content": message},
                         {"role": "assistant", "content": clean_response}
                     ],
                     user_id=user_id
                 ))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
                 # Note: Errors are logged inside add_memory function
             
             # Check full response for JSON if not found during streaming
@@ -15,7 +15,13 @@ logger = logging.getLogger(__name__)
 # Database setup
 logger.info(f"[DB] Connecting to database: {settings.database_url[:30]}...")
 try:
-    engine = create_engine(settings.database_url)
+    # Pre-ping on checkout and recycle idle connections so a connection
+    # dropped by the server or a proxy isn't handed to a request
+    engine = create_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base = declarative_base()
     logger.info("[DB] Database engine created successfully")
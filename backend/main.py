@@ -2,9 +2,13 @@
 RELATRIX - Clean Setup
 Ultra simple FastAPI application
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import asyncio
+import hashlib
+import json
+import time
 
 # Configure logging
 logging.basicConfig(
@@ -38,15 +42,44 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# Health check endpoint
+# Health check endpoint - body is static, so serialize it once
+HEALTH_BYTES = json.dumps({"status": "healthy", "version": "2.0.0"}).encode()
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "2.0.0"}
+    return Response(content=HEALTH_BYTES, media_type="application/json")
+
+# Detailed health check - result is reused for a few seconds so repeated
+# probes share one database round-trip
+DETAILED_HEALTH_TTL = 5.0
+_detailed_health_cache = {"checked_at": 0.0, "result": None}
+_detailed_health_lock = asyncio.Lock()
+
+def _detailed_health_is_fresh() -> bool:
+    return (
+        _detailed_health_cache["result"] is not None
+        and time.monotonic() - _detailed_health_cache["checked_at"] < DETAILED_HEALTH_TTL
+    )
 
-# Detailed health check
 @app.get("/health/detailed")
 async def detailed_health_check():
     """Check health of all services"""
+    if _detailed_health_is_fresh():
+        return _detailed_health_cache["result"]
+    
+    async with _detailed_health_lock:
+        # Another caller may have refreshed the cache while we waited
+        if _detailed_health_is_fresh():
+            return _detailed_health_cache["result"]
+        
+        # Blocking DB probe - keep it off the event loop
+        health = await asyncio.to_thread(_run_detailed_health_check)
+        _detailed_health_cache["result"] = health
+        _detailed_health_cache["checked_at"] = time.monotonic()
+        return health
+
+def _run_detailed_health_check():
+    """Probe database, Mem0 and OpenAI configuration"""
     from database import SessionLocal, Agent
     from memory_service import client as mem0_client
     from config import settings
@@ -145,11 +178,21 @@ async def update_settings(settings: dict):
     logger.info(f"System settings updated: {system_settings}")
     return system_settings
 
+# Models list is static for the process lifetime - serialize once and tag it
+MODELS_BYTES = json.dumps(get_all_models()).encode()
+MODELS_ETAG = f'"{hashlib.blake2b(MODELS_BYTES, digest_size=8).hexdigest()}"'
+
 # Models endpoint
 @app.get("/api/models")
-async def get_models():
+async def get_models(request: Request):
     """Get all available models organized by provider"""
-    return get_all_models()
+    if request.headers.get("if-none-match") == MODELS_ETAG:
+        return Response(status_code=304, headers={"ETag": MODELS_ETAG})
+    return Response(
+        content=MODELS_BYTES,
+        media_type="application/json",
+        headers={"ETag": MODELS_ETAG}
+    )
 
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
@@ -196,5 +239,14 @@ async def startup_event():
     logger.info("Default agents seeded")
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Import string (not the app object) so uvicorn can spawn worker processes.
+    # system_settings lives in-process, so keep a single worker unless
+    # WEB_CONCURRENCY is set explicitly.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        workers=int(os.getenv("WEB_CONCURRENCY", 1))
+    )
\ No newline at end of file
@@ -1,81 +1,134 @@
 """Admin endpoint to run database migrations - improved version"""
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy import text, create_engine
-from typing import Dict, List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from typing import Dict, Iterator, List, Optional, Tuple
+from functools import lru_cache
+import asyncio
+import os
 import re
 
-from app.database import get_db
+from app.database import get_db, get_sync_engine
 from app.database.connection import HAS_DATABASE
 from app.core.security import get_current_user
-from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+MIGRATION_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "database", "memory_modes_schema.sql")
 
-def split_sql_statements(sql: str) -> List[str]:
-    """Split SQL into individual statements, handling functions properly"""
-    # Remove comments
-    sql = re.sub(r'--.*$', '', sql, flags=re.MULTILINE)
-    
-    # Split by semicolon but not inside function definitions
-    statements = []
-    current = []
-    in_function = False
+# Characters that can change tokenizer state - everything else is skipped in bulk
+_SPECIAL_RE = re.compile(r"['\"$;/-]")
+# Dollar-quote opener: $$ or $tag$
+_DOLLAR_TAG_RE = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)?\$')
+# Names of created objects, matched at the start of a statement
+_CREATE_TABLE_RE = re.compile(r'CREATE\s+TABLE\s+(?:IF NOT EXISTS\s+)?(\w+)', re.I)
+_CREATE_FUNC_RE = re.compile(r'CREATE\s+(?:OR REPLACE\s+)?FUNCTION\s+(\w+)', re.I)
+# Postgres SQLSTATEs for "object already exists" - safe to skip on re-runs
+_ALREADY_EXISTS_CODES = frozenset({
+    '42P07',  # duplicate_table
+    '42710',  # duplicate_object
+    '42701',  # duplicate_column
+    '42P06',  # duplicate_schema
+    '42723',  # duplicate_function
+})
+
+
+def _skip_quoted(sql: str, i: int, quote: str) -> int:
+    """Return the index just past the quoted run starting at i ('' and "" escape)"""
+    j = i + 1
+    while True:
+        j = sql.find(quote, j)
+        if j == -1:
+            return len(sql)
+        if sql.startswith(quote, j + 1):
+            j += 2
+            continue
+        return j + 1
+
+
+def _tokenize_sql(sql: str) -> Iterator[str]:
+    """
+    Yield top-level statements in a single pass over the SQL text.
+    Semicolons inside quotes, comments and dollar-quoted bodies ($$ or $tag$)
+    never end a statement; comments are dropped from the output.
+    """
+    parts = []
+    start = 0
+    n = len(sql)
+    match = _SPECIAL_RE.search(sql)
     
-    for line in sql.split('\n'):
-        line = line.strip()
-        
-        # Check for function start
-        if 'CREATE OR REPLACE FUNCTION' in line or 'CREATE FUNCTION' in line:
-            in_function = True
+    while match:
+        i = match.start()
+        ch = sql[i]
         
-        # Check for function end
-        if line == '$$ LANGUAGE plpgsql;' or line.endswith('$$ language \'plpgsql\';'):
-            in_function = False
-            current.append(line)
-            statements.append('\n'.join(current))
-            current = []
-            continue
+        if ch == "'" or ch == '"':
+            i = _skip_quoted(sql, i, ch)
+        elif ch == '-':
+            if sql.startswith('--', i):
+                parts.append(sql[start:i])
+                end = sql.find('\n', i)
+                i = start = n if end == -1 else end
+            else:
+                i += 1
+        elif ch == '/':
+            if sql.startswith('/*', i):
+                parts.append(sql[start:i])
+                parts.append(' ')
+                end = sql.find('*/', i + 2)
+                i = start = n if end == -1 else end + 2
+            else:
+                i += 1
+        elif ch == '$':
+            tag = _DOLLAR_TAG_RE.match(sql, i)
+            if tag:
+                end = sql.find(tag.group(0), tag.end())
+                i = n if end == -1 else end + len(tag.group(0))
+            else:
+                i += 1
+        else:  # top-level ';'
+            parts.append(sql[start:i])
+            statement = ''.join(parts).strip()
+            if statement:
+                yield statement
+            parts = []
+            i = start = i + 1
         
-        # Regular statement end
-        if line.endswith(';') and not in_function:
-            current.append(line)
-            statements.append('\n'.join(current))
-            current = []
-        else:
-            current.append(line)
-    
-    # Add any remaining
-    if current:
-        statements.append('\n'.join(current))
+        match = _SPECIAL_RE.search(sql, i)
     
-    return [s.strip() for s in statements if s.strip()]
+    parts.append(sql[start:])
+    statement = ''.join(parts).strip()
+    if statement:
+        yield statement
 
 
-@router.post("/run-memory-modes-migration-v2")
-async def run_memory_modes_migration_v2(
-    current_user: Dict = Depends(get_current_user)
-):
-    """Execute Memory Modes migration with better error handling"""
-    
-    if not HAS_DATABASE:
-        raise HTTPException(503, "Database not configured")
-    
-    # Read migration SQL
-    import os
-    migration_path = os.path.join(os.path.dirname(__file__), "..", "..", "database", "memory_modes_schema.sql")
-    
-    try:
-        with open(migration_path, "r") as f:
-            migration_sql = f.read()
-    except FileNotFoundError:
-        raise HTTPException(404, f"Migration file not found: {migration_path}")
-    
+def split_sql_statements(sql: str) -> List[str]:
+    """Split SQL into individual statements, handling functions properly"""
+    return list(_tokenize_sql(sql))
+
+
+@lru_cache(maxsize=4)
+def _load_statements(path: str, mtime: float) -> Tuple[str, ...]:
+    """Read and split a migration file - mtime in the key drops stale entries"""
+    with open(path, "r") as f:
+        return tuple(split_sql_statements(f.read()))
+
+
+def _is_already_exists(error: Exception) -> bool:
+    """Check the driver's SQLSTATE, falling back to the message for other drivers"""
+    orig = getattr(error, 'orig', None)
+    code = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+    if code:
+        return code in _ALREADY_EXISTS_CODES
+    return "already exists" in str(error)
+
+
+def _run_migration(statements: Tuple[str, ...], sync_engine: Engine) -> Dict:
+    """Execute statements and verify the schema - blocking, run in a worker thread"""
     results = {
-        "total_statements": 0,
+        "total_statements": len(statements),
         "successful": 0,
         "skipped": 0,
         "failed": 0,
@@ -85,61 +138,55 @@ async def run_memory_modes_migration_v2(
         "warnings": []
     }
     
-    # Create sync engine
-    sync_engine = create_engine(settings.database_url)
-    
-    # Split SQL properly
-    statements = split_sql_statements(migration_sql)
-    results["total_statements"] = len(statements)
-    
-    # Execute each statement in its own transaction
-    for i, statement in enumerate(statements):
-        if not statement or statement.startswith('--'):
-            continue
-        
-        try:
-            with sync_engine.begin() as conn:
+    # Execute on one connection in autocommit mode - every statement commits
+    # on its own, so a failure never rolls back its neighbours
+    with sync_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # The tokenizer only yields non-empty, comment-free statements
+        for i, statement in enumerate(statements):
+            try:
                 conn.execute(text(statement))
                 results["successful"] += 1
                 
-                # Track what was created
-                if 'CREATE TABLE' in statement:
-                    table_match = re.search(r'CREATE TABLE\s+(?:IF NOT EXISTS\s+)?(\w+)', statement)
+                # Track what was created - only CREATE statements can match
+                if statement[:6].upper() == 'CREATE':
+                    table_match = _CREATE_TABLE_RE.match(statement)
                     if table_match:
                         results["tables_created"].append(table_match.group(1))
-                elif 'CREATE FUNCTION' in statement:
-                    func_match = re.search(r'CREATE\s+(?:OR REPLACE\s+)?FUNCTION\s+(\w+)', statement)
-                    if func_match:
-                        results["functions_created"].append(func_match.group(1))
+                    else:
+                        func_match = _CREATE_FUNC_RE.match(statement)
+                        if func_match:
+                            results["functions_created"].append(func_match.group(1))
                         
-        except Exception as e:
-            error_msg = str(e)
-            if "already exists" in error_msg:
-                results["skipped"] += 1
-                results["warnings"].append(f"Statement {i+1}: Already exists (skipped)")
-            else:
-                results["failed"] += 1
-                results["errors"].append(f"Statement {i+1}: {error_msg[:200]}")
-                logger.error(f"Failed statement {i+1}: {statement[:100]}... Error: {error_msg}")
+            except Exception as e:
+                if _is_already_exists(e):
+                    results["skipped"] += 1
+                    results["warnings"].append(f"Statement {i+1}: Already exists (skipped)")
+                else:
+                    error_msg = str(e)
+                    results["failed"] += 1
+                    results["errors"].append(f"Statement {i+1}: {error_msg[:200]}")
+                    logger.error(f"Failed statement {i+1}: {statement[:100]}... Error: {error_msg}")
     
-    # Verify final state
+    # Verify final state - tables and column in a single round-trip
     try:
         with sync_engine.connect() as conn:
-            # Check tables
-            result = conn.execute(text("""
-                SELECT table_name 
+            rows = conn.execute(text("""
+                SELECT 'table' AS kind, table_name AS name
                 FROM information_schema.tables 
                 WHERE table_schema = 'public' 
                 AND table_name IN ('memory_configs', 'memory_metrics', 'memory_global_config')
-            """))
-            existing_tables = [row[0] for row in result]
-            
-            # Check column
-            result = conn.execute(text("""
-                SELECT 1 FROM information_schema.columns 
+                UNION ALL
+                SELECT 'column', column_name
+                FROM information_schema.columns 
                 WHERE table_name = 'chat_sessions' AND column_name = 'memory_mode'
             """))
-            memory_mode_exists = result.fetchone() is not None
+            existing_tables = []
+            memory_mode_exists = False
+            for kind, name in rows:
+                if kind == 'table':
+                    existing_tables.append(name)
+                else:
+                    memory_mode_exists = True
             
             results["verification"] = {
                 "tables_exist": existing_tables,
@@ -149,6 +196,28 @@ async def run_memory_modes_migration_v2(
     except Exception as e:
         results["verification"] = {"error": str(e)}
     
+    return results
+
+
+@router.post("/run-memory-modes-migration-v2")
+async def run_memory_modes_migration_v2(
+    current_user: Dict = Depends(get_current_user),
+    sync_engine: Optional[Engine] = Depends(get_sync_engine)
+):
+    """Execute Memory Modes migration with better error handling"""
+    
+    if not HAS_DATABASE or sync_engine is None:
+        raise HTTPException(503, "Database not configured")
+    
+    # Read and split migration SQL (cached until the file changes)
+    try:
+        statements = _load_statements(MIGRATION_PATH, os.stat(MIGRATION_PATH).st_mtime)
+    except FileNotFoundError:
+        raise HTTPException(404, f"Migration file not found: {MIGRATION_PATH}")
+    
+    # Blocking DB work runs in a thread so the event loop keeps serving requests
+    results = await asyncio.to_thread(_run_migration, statements, sync_engine)
+    
     # Determine overall status
     if results["failed"] > 0:
         status = "failed"
@@ -4,9 +4,11 @@ Provides CRUD operations for RELATRIX agents
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
 from uuid import UUID
 import logging
+import orjson
 from datetime import datetime
 
 from ..models.agent import (
@@ -18,9 +20,19 @@ from ..dependencies import get_agent_service
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/admin/agents", tags=["agents"])
+# OPENAI_MODELS is static - serialize it once at import
+_OPENAI_MODELS_JSON = orjson.dumps({
+    "models": [m.model_dump() for m in OPENAI_MODELS],
+    "total": len(OPENAI_MODELS)
+})
 
-@router.get("/", response_model=AgentListResponse)
+router = APIRouter(
+    prefix="/api/admin/agents",
+    tags=["agents"],
+    default_response_class=ORJSONResponse
+)
+
+@router.get("/", response_model=AgentListResponse, response_model_exclude_none=True)
 async def list_agents(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     agent_service: AgentService = Depends(get_agent_service)
@@ -38,7 +50,7 @@ async def list_agents(
         logger.error(f"Error listing agents: {e}")
         raise HTTPException(status_code=500, detail="Failed to list agents")
 
-@router.get("/{slug}", response_model=Agent)
+@router.get("/{slug}", response_model=Agent, response_model_exclude_none=True)
 async def get_agent(
     slug: str,
     agent_service: AgentService = Depends(get_agent_service)
@@ -102,6 +114,8 @@ async def update_agent(
         
         # Update agent
         agent = await agent_service.update_agent(slug, agent_update)
+        if agent is None:
+            raise HTTPException(status_code=404, detail=f"Agent '{slug}' not found")
         return agent
     except HTTPException:
         raise
@@ -118,11 +132,8 @@ async def delete_agent(
     Delete an agent (soft delete - sets is_active to false)
     """
     try:
-        existing = await agent_service.get_agent_by_slug(slug)
-        if not existing:
+        if not await agent_service.delete_agent(slug):
             raise HTTPException(status_code=404, detail=f"Agent '{slug}' not found")
-        
-        await agent_service.delete_agent(slug)
         return {"message": f"Agent '{slug}' deleted successfully"}
     except HTTPException:
         raise
@@ -163,11 +174,10 @@ async def get_agent_versions(
     Get version history for an agent
     """
     try:
-        agent = await agent_service.get_agent_by_slug(slug)
-        if not agent:
+        versions = await agent_service.get_agent_versions_by_slug(slug, limit=limit)
+        if versions is None:
             raise HTTPException(status_code=404, detail=f"Agent '{slug}' not found")
         
-        versions = await agent_service.get_agent_versions(agent.id, limit=limit)
         return {"versions": versions, "total": len(versions)}
     except HTTPException:
         raise
@@ -185,11 +195,12 @@ async def restore_agent_version(
     Restore an agent to a previous version
     """
     try:
-        agent = await agent_service.get_agent_by_slug(slug)
-        if not agent:
-            raise HTTPException(status_code=404, detail=f"Agent '{slug}' not found")
-        
-        restored_agent = await agent_service.restore_agent_version(agent.id, version_id)
+        restored_agent = await agent_service.restore_agent_version(slug, version_id)
+        if restored_agent is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Version '{version_id}' of agent '{slug}' not found"
+            )
         return restored_agent
     except HTTPException:
         raise
@@ -202,7 +213,4 @@ async def get_openai_models():
     """
     Get list of available OpenAI models with their specifications
     """
-    return {
-        "models": OPENAI_MODELS,
-        "total": len(OPENAI_MODELS)
-    }
\ No newline at end of file
+    return Response(content=_OPENAI_MODELS_JSON, media_type="application/json")
\ No newline at end of file
@@ -6,12 +6,12 @@ Direct and simple!
 import logging
 from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-import json
+import orjson
 
-from app.orchestrator.orchestrator import orchestrator
+from app.orchestrator.orchestrator import get_orchestrator
 from app.core.security import get_current_user_optional
 
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app):
     """Initialize orchestrator on startup"""
+    orchestrator = get_orchestrator()
     try:
         await orchestrator.initialize()
         logger.info("Orchestrator initialized")
@@ -28,10 +29,11 @@ async def lifespan(app):
     
     yield
     
-    # Cleanup not needed for simple version
+    # Close Mem0 and OpenAI connections
+    await orchestrator.shutdown()
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class ChatMessage(BaseModel):
@@ -54,23 +56,25 @@ async def stream_chat(
         user_id = current_user.get("id") if current_user else None
         logger.info(f"Chat request from user: {user_id or 'anonymous'}")
         
+        # Static part of every SSE frame - only the content is encoded per chunk
+        # JSON format for frontend compatibility
+        frame_prefix = (
+            b'data: {"type":"content","agent_id":'
+            + orjson.dumps(request.agent_slug)
+            + b',"content":'
+        )
+        
         # Stream response
         async def generate():
-            async for chunk in orchestrator.process_message(
+            async for chunk in get_orchestrator().process_message(
                 message=request.message,
                 user_id=user_id,
                 agent_slug=request.agent_slug
             ):
-                # JSON format for frontend compatibility
-                data = {
-                    "type": "content",
-                    "content": chunk,
-                    "agent_id": request.agent_slug
-                }
-                yield f"data: {json.dumps(data)}\n\n"
+                yield frame_prefix + orjson.dumps(chunk) + b'}\n\n'
             
             # End of stream
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
         
         return StreamingResponse(
             generate(),
@@ -87,25 +91,34 @@ async def stream_chat(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Serialized /chat/agents body, rebuilt only when the agents version changes
+_agents_cache: Dict[str, Any] = {"version": None, "body": None}
+
+
 @router.get("/chat/agents")
 async def list_agents():
     """List all available agents"""
+    orchestrator = get_orchestrator()
     agents = await orchestrator.get_agents()
     
-    return {
-        "agents": [
-            {
-                "slug": agent.slug,
-                "name": agent.name,
-                "description": agent.description
-            }
-            for agent in agents.values()
-        ]
-    }
+    if _agents_cache["version"] != orchestrator.agents_version:
+        _agents_cache["body"] = orjson.dumps({
+            "agents": [
+                {
+                    "slug": agent.slug,
+                    "name": agent.name,
+                    "description": agent.description
+                }
+                for agent in agents
+            ]
+        })
+        _agents_cache["version"] = orchestrator.agents_version
+    
+    return Response(content=_agents_cache["body"], media_type="application/json")
 
 
 @router.post("/chat/reload-agents")
 async def reload_agents():
     """Reload agents from database"""
-    count = await orchestrator.reload_agents()
+    count = await get_orchestrator().reload_agents()
     return {"success": True, "agents_loaded": count}
\ No newline at end of file
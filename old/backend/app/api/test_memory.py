@@ -4,7 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
-from app.orchestrator.orchestrator import orchestrator
+from app.orchestrator.orchestrator import get_orchestrator
 from app.orchestrator.memory_modes import MemoryMode
 
 router = APIRouter()
@@ -19,6 +19,7 @@ class TestChatRequest(BaseModel):
 @router.post("/test-chat-with-user")
 async def test_chat_with_user(request: TestChatRequest):
     """Test chat endpoint that includes user_id for memory operations"""
+    orchestrator = get_orchestrator()
     
     # Create or get session
     session = await orchestrator.create_session(
@@ -48,6 +49,7 @@ async def test_chat_with_user(request: TestChatRequest):
 @router.get("/test-memory-operations/{session_id}")
 async def test_memory_operations(session_id: str):
     """Test memory operations for a session"""
+    orchestrator = get_orchestrator()
     
     # Get session
     session = orchestrator.active_sessions.get(session_id)
@@ -91,6 +93,7 @@ async def test_memory_operations(session_id: str):
 @router.post("/test-memory-refresh/{session_id}")
 async def test_memory_refresh(session_id: str):
     """Force memory refresh for testing"""
+    orchestrator = get_orchestrator()
     
     session = orchestrator.active_sessions.get(session_id)
     if not session:
@@ -122,6 +125,7 @@ async def test_memory_refresh(session_id: str):
 async def simulate_memory_modes():
     """Simulate different memory modes to see how they work"""
     
+    orchestrator = get_orchestrator()
     results = {}
     test_user = "test-user-sim"
     
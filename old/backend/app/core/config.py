@@ -72,6 +72,10 @@ class Settings(BaseSettings):
         default="relatrix-agent",
         description="Mem0 agent ID"
     )
+    mem0_search_timeout: float = Field(
+        default=2.0,
+        description="Seconds to wait for Mem0 search before answering without memories"
+    )
     
     # Supabase Settings
     supabase_url: str = Field(
@@ -3,5 +3,6 @@ Database package for RELATRIX backend
 """
 
 from .connection import get_db, init_db
+from .sync_engine import get_sync_engine, dispose_sync_engine
 
-__all__ = ['get_db', 'init_db']
\ No newline at end of file
+__all__ = ['get_db', 'init_db', 'get_sync_engine', 'dispose_sync_engine']
\ No newline at end of file
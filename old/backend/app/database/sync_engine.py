@@ -0,0 +1,36 @@
+"""
+Shared synchronous engine for blocking DDL work (migrations)
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from .connection import HAS_DATABASE
+
+
+@lru_cache()
+def get_sync_engine() -> Optional[Engine]:
+    """Get sync engine - created on first use and reused afterwards"""
+    if not HAS_DATABASE:
+        return None
+    
+    return create_engine(
+        settings.database_url,
+        pool_size=2,
+        max_overflow=2,
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
+
+
+def dispose_sync_engine():
+    """Close pooled connections of the sync engine if it was created"""
+    if get_sync_engine.cache_info().currsize:
+        engine = get_sync_engine()
+        if engine is not None:
+            engine.dispose()
+        get_sync_engine.cache_clear()
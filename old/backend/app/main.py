@@ -7,6 +7,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any
+from contextlib import asynccontextmanager
 import logging
 import os
 
@@ -17,7 +18,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import lifespan before creating app
-from .api.chat import lifespan
+from .api.chat import lifespan as chat_lifespan
+from .database import dispose_sync_engine
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the chat lifespan, then release app-wide resources"""
+    async with chat_lifespan(app):
+        yield
+    
+    # Release pooled migration connections
+    dispose_sync_engine()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
@@ -8,6 +8,18 @@ from datetime import datetime
 from pydantic import BaseModel, Field, validator
 from uuid import UUID
 
+# Models accepted for agent configuration (order kept for the error message)
+_VALID_MODEL_NAMES = (
+    'gpt-4-turbo-preview',
+    'gpt-4-turbo',
+    'gpt-4',
+    'gpt-4-32k',
+    'gpt-3.5-turbo',
+    'gpt-3.5-turbo-16k'
+)
+_VALID_MODELS = frozenset(_VALID_MODEL_NAMES)
+_VALID_MODELS_MSG = f"Model must be one of: {', '.join(_VALID_MODEL_NAMES)}"
+
 class AgentBase(BaseModel):
     """Base agent model with common fields"""
     slug: str = Field(..., min_length=1, max_length=50)
@@ -24,16 +36,8 @@ class AgentBase(BaseModel):
     @validator('openai_model')
     def validate_model(cls, v):
         """Validate OpenAI model name"""
-        valid_models = [
-            'gpt-4-turbo-preview',
-            'gpt-4-turbo',
-            'gpt-4',
-            'gpt-4-32k',
-            'gpt-3.5-turbo',
-            'gpt-3.5-turbo-16k'
-        ]
-        if v not in valid_models:
-            raise ValueError(f"Model must be one of: {', '.join(valid_models)}")
+        if v not in _VALID_MODELS:
+            raise ValueError(_VALID_MODELS_MSG)
         return v
 
 class AgentCreate(AgentBase):
@@ -3,8 +3,9 @@ Simple models for the orchestrator
 Just the essentials!
 """
 
+from functools import cached_property
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -29,6 +30,11 @@ class Agent(BaseModel):
             UUID: lambda v: str(v)
         }
 
+    @cached_property
+    def system_message(self) -> Dict[str, str]:
+        """OpenAI system message for this agent - built once per loaded agent"""
+        return {"role": "system", "content": self.system_prompt}
+
 
 class Message(BaseModel):
     """Simple message structure"""
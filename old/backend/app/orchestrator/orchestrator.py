@@ -3,10 +3,13 @@ Simple Orchestrator - Direct integration with Mem0 and OpenAI
 No unnecessary abstractions!
 """
 
+import asyncio
 import logging
-from typing import AsyncGenerator, Optional, Dict, Any
-import json
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Optional, Dict, Any, Tuple
 import httpx
+import orjson
 
 from openai import AsyncOpenAI
 
@@ -16,10 +19,66 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Coalesce streamed deltas - flush when a new delta brings the pending
+# text to this many chars or arrives this many seconds after the last flush
+STREAM_FLUSH_CHARS = 256
+STREAM_FLUSH_INTERVAL = 0.03
+
+# In-process cache of Mem0 searches - repeated questions skip the API
+MEM0_CACHE_SIZE = 1024
+MEM0_CACHE_TTL = 60.0
+
+
+class MemorySearchCache:
+    """Per-process TTL + LRU cache of Mem0 search results"""
+    
+    __slots__ = ("maxsize", "ttl", "_entries", "_generations")
+    
+    def __init__(self, maxsize: int = MEM0_CACHE_SIZE, ttl: float = MEM0_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str, int], Tuple[float, Any]]" = OrderedDict()
+        # Per-user counter bumped on invalidation - a user's searches that
+        # started before it aren't stored
+        self._generations: Dict[str, int] = {}
+    
+    def generation(self, user_id: str) -> int:
+        """Current invalidation count for a user"""
+        return self._generations.get(user_id, 0)
+    
+    def get(self, key: Tuple[str, str, int]) -> Optional[Any]:
+        """Return a fresh cached result, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Tuple[str, str, int], value: Any, generation: int):
+        """Store a result unless memories changed while it was fetched"""
+        if generation != self.generation(key[0]):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def invalidate_user(self, user_id: str):
+        """Drop all cached searches for a user"""
+        self._generations[user_id] = self.generation(user_id) + 1
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
 
 class AsyncMem0Client:
     """Async client for Mem0 API using httpx"""
     
+    __slots__ = ("api_key", "base_url", "headers", "_client", "_cache")
+    
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.mem0.ai/v1"
@@ -27,60 +86,78 @@ class AsyncMem0Client:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # One pooled client for the app's lifetime - keeps connections alive
+        # between calls instead of a new TCP+TLS handshake per request
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        self._cache = MemorySearchCache()
     
     async def search(self, query: str, user_id: str, limit: int = 20):
         """Async search memories"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/memories/search/",
-                headers=self.headers,
-                json={
-                    "query": query,
-                    "user_id": user_id,
-                    "limit": limit,
-                    "output_format": "v1.1"
-                },
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            # Extract memories from response
-            if "results" in data:
-                return data["results"]
-            return data
+        key = (user_id, query, limit)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        generation = self._cache.generation(user_id)
+        
+        response = await self._client.post(
+            "/memories/search/",
+            content=orjson.dumps({
+                "query": query,
+                "user_id": user_id,
+                "limit": limit,
+                "output_format": "v1.1"
+            })
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        # Extract memories from response
+        memories = data["results"] if "results" in data else data
+        self._cache.put(key, memories, generation)
+        return memories
     
     async def add(self, messages: list, user_id: str, **kwargs):
         """Async add memories"""
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "messages": messages,
-                "user_id": user_id,
-                "version": "v2",
-                "output_format": "v1.1"
-            }
-            payload.update(kwargs)
-            
-            response = await client.post(
-                f"{self.base_url}/memories/",
-                headers=self.headers,
-                json=payload,
-                timeout=10.0
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Mem0 add response: {json.dumps(result, indent=2)}")
-            return result
+        payload = {
+            "messages": messages,
+            "user_id": user_id,
+            "version": "v2",
+            "output_format": "v1.1"
+        }
+        payload.update(kwargs)
+        
+        response = await self._client.post("/memories/", content=orjson.dumps(payload))
+        response.raise_for_status()
+        
+        result = orjson.loads(response.content)
+        # New memories may change what searches return for this user
+        self._cache.invalidate_user(user_id)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Mem0 add response: %s", orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+        return result
+    
+    async def close(self):
+        """Close pooled connections"""
+        await self._client.aclose()
 
 
 class SimpleOrchestrator:
     """Ultra simple orchestrator - just connects the pieces"""
     
+    __slots__ = ("registry", "mem0", "openai", "_initialized", "_bg_tasks")
+    
     def __init__(self):
         self.registry = AgentRegistry()
         self.mem0 = None
-        self.openai = AsyncOpenAI(api_key=settings.openai_api_key)
+        # Created in initialize() so its HTTP pool binds to the running loop
+        self.openai = None
         self._initialized = False
+        # Strong refs to in-flight background saves so they aren't GC'd
+        self._bg_tasks = set()
         logger.info("Simple Orchestrator initialized")
     
     async def initialize(self):
@@ -91,6 +168,16 @@ class SimpleOrchestrator:
         # Load agents from database
         await self.registry.load_agents()
         
+        # Own the OpenAI HTTP pool so concurrent streams don't queue on
+        # the SDK's default connection limits
+        self.openai = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+        )
+        
         # Initialize Async Mem0 if API key is configured
         if hasattr(settings, 'mem0_api_key') and not settings.mem0_api_key.startswith('m0-placeholder'):
             try:
@@ -103,6 +190,18 @@ class SimpleOrchestrator:
         self._initialized = True
         logger.info("Orchestrator ready")
     
+    async def shutdown(self):
+        """Finish pending Mem0 saves and release network clients"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        if self.mem0:
+            await self.mem0.close()
+            self.mem0 = None
+        if self.openai:
+            await self.openai.close()
+            self.openai = None
+        self._initialized = False
+    
     async def process_message(
         self,
         message: str,
@@ -116,46 +215,68 @@ class SimpleOrchestrator:
         if not self._initialized:
             await self.initialize()
         
+        # Start the Mem0 search (if user is logged in) so it runs while
+        # the agent is resolved instead of after it
+        search_task = None
+        if user_id and self.mem0:
+            logger.info("Searching Mem0 for user %s", user_id)
+            # Let Mem0 decide what's relevant for this message
+            search_task = asyncio.create_task(self.mem0.search(
+                query=message,
+                user_id=user_id,
+                limit=20  # Increased from 5 to get more context
+            ))
+        
         # 1. Get agent
         agent = await self.registry.get_agent(agent_slug)
         if not agent:
-            logger.error(f"Agent {agent_slug} not found")
+            if search_task:
+                search_task.cancel()
+            logger.error("Agent %s not found", agent_slug)
             yield f"Error: Agent {agent_slug} not found"
             return
         
-        # 2. Get memories from Mem0 (if user is logged in)
+        # 2. Get memories from Mem0 - a slow search must not hold up the reply
         memories = []
-        if user_id and self.mem0:
+        if search_task:
             try:
-                logger.info(f"Searching Mem0 for user {user_id}")
-                # Let Mem0 decide what's relevant for this message
-                memories = await self.mem0.search(
-                    query=message,
-                    user_id=user_id,
-                    limit=20  # Increased from 5 to get more context
-                )
-                logger.info(f"Found {len(memories)} memories")
-            except Exception as e:
-                logger.error(f"Mem0 search failed: {e}")
+                done, _ = await asyncio.wait({search_task}, timeout=settings.mem0_search_timeout)
+                if done:
+                    try:
+                        memories = search_task.result()
+                        logger.info("Found %d memories", len(memories))
+                    except Exception as e:
+                        logger.error("Mem0 search failed: %s", e)
+                else:
+                    logger.warning(
+                        "Mem0 search timed out after %ss, continuing without memories",
+                        settings.mem0_search_timeout
+                    )
+            finally:
+                # Timed out, or the client went away while we waited
+                if not search_task.done():
+                    search_task.cancel()
         
         # 3. Build messages for OpenAI
-        messages = [
-            {"role": "system", "content": agent.system_prompt}
-        ]
+        messages = [agent.system_message]
         
         # Add memories as context if available
         if memories:
-            context = "Relevant user context:\n"
-            for mem in memories:
-                # Handle different memory formats
-                memory_content = mem.get('memory', mem.get('content', str(mem)))
-                context += f"- {memory_content}\n"
+            # Handle different memory formats
+            context = "Relevant user context:\n" + "".join(
+                f"- {mem.get('memory', mem.get('content', str(mem)))}\n"
+                for mem in memories
+            )
             messages.append({"role": "system", "content": context})
-            logger.debug(f"Added context: {context}")
+            logger.debug("Added context: %s", context)
         
         messages.append({"role": "user", "content": message})
         
         # 4. Stream response from OpenAI
+        # Deltas are often a few chars - batch them so each SSE frame
+        # carries more text. Limits are checked as each delta arrives, so
+        # buffered text can wait until the next delta if the model pauses
+        pending = []
         try:
             stream = await self.openai.chat.completions.create(
                 model=agent.openai_model,
@@ -165,40 +286,72 @@ class SimpleOrchestrator:
                 stream=True
             )
             
-            full_response = ""
+            # Collect tokens in a list - repeated += copies the reply each time
+            parts = []
+            loop = asyncio.get_running_loop()
+            pending_size = 0
+            last_flush = loop.time()
             async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    yield content
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                parts.append(content)
+                pending.append(content)
+                pending_size += len(content)
+                
+                now = loop.time()
+                if pending_size >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                    yield "".join(pending)
+                    pending.clear()
+                    pending_size = 0
+                    last_flush = now
             
-            # 5. Save to Mem0 (if user is logged in)
+            if pending:
+                yield "".join(pending)
+                pending.clear()
+            full_response = "".join(parts)
+            
+            # 5. Save to Mem0 (if user is logged in) - in the background,
+            # so the stream closes without waiting on the Mem0 round-trip
             if user_id and self.mem0 and full_response:
-                try:
-                    # Save the conversation pair
-                    result = await self.mem0.add(
-                        messages=[
-                            {"role": "user", "content": message},
-                            {"role": "assistant", "content": full_response}
-                        ],
-                        user_id=user_id
-                        # version and output_format already set in AsyncMem0Client
-                    )
-                    logger.info(f"Saved to Mem0: {result}")
-                except Exception as e:
-                    logger.error(f"Failed to save to Mem0: {e}")
+                task = asyncio.create_task(self._save_to_mem0(user_id, message, full_response))
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
             
         except Exception as e:
-            logger.error(f"OpenAI streaming error: {e}")
+            logger.error("OpenAI streaming error: %s", e)
+            # Deliver text the model already sent before reporting the error
+            if pending:
+                yield "".join(pending)
             yield f"Error: {str(e)}"
     
-    async def get_agents(self) -> Dict[str, Agent]:
+    async def _save_to_mem0(self, user_id: str, message: str, response: str):
+        """Save a conversation pair to Mem0"""
+        try:
+            result = await self.mem0.add(
+                messages=[
+                    {"role": "user", "content": message},
+                    {"role": "assistant", "content": response}
+                ],
+                user_id=user_id
+                # version and output_format already set in AsyncMem0Client
+            )
+            logger.info("Saved to Mem0: %s", result)
+        except Exception as e:
+            logger.error("Failed to save to Mem0: %s", e)
+    
+    async def get_agents(self) -> Tuple[Agent, ...]:
         """Get all available agents"""
         if not self._initialized:
             await self.initialize()
-        # Convert list to dict
-        agents_list = await self.registry.get_all_agents()
-        return {agent.slug: agent for agent in agents_list}
+        return await self.registry.get_all_agents()
+    
+    @property
+    def agents_version(self) -> int:
+        """Bumped whenever the agent set is (re)loaded"""
+        return self.registry.version
     
     async def reload_agents(self) -> int:
         """Reload agents from database"""
@@ -210,11 +363,9 @@ class SimpleOrchestrator:
 _orchestrator = None
 
 def get_orchestrator() -> SimpleOrchestrator:
-    """Get or create orchestrator instance"""
+    """Get or create orchestrator instance on first use"""
     global _orchestrator
+    # No await between check and assignment, so no lock needed on the event loop
     if _orchestrator is None:
         _orchestrator = SimpleOrchestrator()
-    return _orchestrator
-
-# For backward compatibility
-orchestrator = get_orchestrator()
\ No newline at end of file
+    return _orchestrator
\ No newline at end of file
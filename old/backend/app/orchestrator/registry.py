@@ -3,9 +3,10 @@ Agent Registry - Manages agent configurations loaded from database
 """
 
 import logging
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from datetime import datetime
 import asyncio
+import time
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
@@ -29,8 +30,11 @@ class AgentRegistry:
     def __init__(self, cache_ttl: int = 300):  # 5 minutes cache
         self.agents: Dict[str, Agent] = {}
         self.cache_ttl = cache_ttl
-        self.last_loaded: Optional[datetime] = None
+        self.last_loaded: Optional[float] = None  # time.monotonic() of last load
         self._lock = asyncio.Lock()
+        # Read-side snapshot, rebuilt only when agents are (re)loaded
+        self.version = 0
+        self._snapshot: Tuple[Agent, ...] = ()
         logger.info("Agent Registry initialized")
     
     async def load_agents(self, force_reload: bool = False) -> Dict[str, Agent]:
@@ -43,6 +47,7 @@ class AgentRegistry:
             # If database not available, use defaults
             if not HAS_DATABASE:
                 self._load_default_agents()
+                self._publish()
                 return self.agents
             
             try:
@@ -75,7 +80,7 @@ class AgentRegistry:
                         )
                         self.agents[agent.slug] = agent
                     
-                    self.last_loaded = datetime.now()
+                    self.last_loaded = time.monotonic()
                     logger.info(f"Loaded {len(self.agents)} agents from database")
                     
                     # If no agents found, load defaults
@@ -83,6 +88,7 @@ class AgentRegistry:
                         logger.warning("No agents in database, loading defaults")
                         self._load_default_agents()
                     
+                    self._publish()
                     return self.agents
                     
             except Exception as e:
@@ -90,15 +96,20 @@ class AgentRegistry:
                 # Fallback to defaults if database fails
                 if not self.agents:
                     self._load_default_agents()
+                self._publish()
                 return self.agents
     
+    def _publish(self):
+        """Rebuild the read-side snapshot after agents changed"""
+        self._snapshot = tuple(self.agents.values())
+        self.version += 1
+    
     def _is_cache_valid(self) -> bool:
         """Check if cache is still valid"""
-        if not self.last_loaded or not self.agents:
+        if self.last_loaded is None or not self.agents:
             return False
         
-        age = datetime.now() - self.last_loaded
-        return age.total_seconds() < self.cache_ttl
+        return time.monotonic() - self.last_loaded < self.cache_ttl
     
     def _load_default_agents(self):
         """Load default hardcoded agents as fallback"""
@@ -190,6 +201,7 @@ class AgentRegistry:
             }
         ]
         
+        now = datetime.now()
         for i, agent_data in enumerate(defaults):
             agent = Agent(
                 id=UUID('00000000-0000-0000-0000-00000000000' + str(i+1)),  # Unique placeholder
@@ -199,8 +211,8 @@ class AgentRegistry:
                 system_prompt=agent_data["system_prompt"],
                 transfer_triggers=agent_data["transfer_triggers"],
                 display_order=i,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+                created_at=now,
+                updated_at=now
             )
             self.agents[agent.slug] = agent
     
@@ -210,11 +222,11 @@ class AgentRegistry:
             await self.load_agents()
         return self.agents.get(slug)
     
-    async def get_all_agents(self) -> List[Agent]:
+    async def get_all_agents(self) -> Tuple[Agent, ...]:
         """Get all active agents"""
         if not self.agents:
             await self.load_agents()
-        return list(self.agents.values())
+        return self._snapshot
     
     async def reload_agents(self) -> Dict[str, Agent]:
         """Force reload agents from database"""
@@ -68,23 +68,25 @@ class AgentService:
             logger.error(f"Error creating agent: {e}")
             raise
     
-    async def update_agent(self, slug: str, agent_update: AgentUpdate) -> Agent:
-        """Update an existing agent"""
+    async def update_agent(self, slug: str, agent_update: AgentUpdate) -> Optional[Agent]:
+        """Update an existing agent, None if no agent has this slug"""
         try:
             # Only include non-None values
             update_data = {k: v for k, v in agent_update.model_dump().items() if v is not None}
             
             response = self.supabase.table('agents').update(update_data).eq('slug', slug).execute()
+            if not response.data:
+                return None
             return Agent(**response.data[0])
         except Exception as e:
             logger.error(f"Error updating agent {slug}: {e}")
             raise
     
     async def delete_agent(self, slug: str) -> bool:
-        """Soft delete an agent by setting is_active to false"""
+        """Soft delete an agent by setting is_active to false, False if not found"""
         try:
-            self.supabase.table('agents').update({'is_active': False}).eq('slug', slug).execute()
-            return True
+            response = self.supabase.table('agents').update({'is_active': False}).eq('slug', slug).execute()
+            return bool(response.data)
         except Exception as e:
             logger.error(f"Error deleting agent {slug}: {e}")
             raise
@@ -163,8 +165,30 @@ class AgentService:
             logger.error(f"Error getting agent versions: {e}")
             raise
     
-    async def restore_agent_version(self, agent_id: UUID, version_id: UUID) -> Agent:
-        """Restore an agent to a previous version"""
+    async def get_agent_versions_by_slug(self, slug: str, limit: int = 10) -> Optional[List[AgentVersion]]:
+        """Get version history for an agent by slug, None if the agent doesn't exist"""
+        try:
+            # Join on agents so the slug filter and the history come back in one query
+            response = (self.supabase.table('agent_versions')
+                       .select('*, agents!inner(slug)')
+                       .eq('agents.slug', slug)
+                       .order('version', desc=True)
+                       .limit(limit)
+                       .execute())
+            
+            if response.data:
+                return [AgentVersion(**version) for version in response.data]
+            
+            # No history - only now find out whether the agent exists at all
+            if await self.get_agent_by_slug(slug) is None:
+                return None
+            return []
+        except Exception as e:
+            logger.error(f"Error getting agent versions for {slug}: {e}")
+            raise
+    
+    async def restore_agent_version(self, slug: str, version_id: UUID) -> Optional[Agent]:
+        """Restore an agent to a previous version, None if agent or version not found"""
         try:
             # Get the version
             version_response = (self.supabase.table('agent_versions')
@@ -174,11 +198,12 @@ class AgentService:
                               .execute())
             
             if not version_response.data:
-                raise ValueError("Version not found")
+                return None
             
             version = version_response.data
             
-            # Update the agent with version data
+            # Update the agent with version data - matching both slug and id
+            # checks the agent exists and owns this version in the same query
             update_data = {
                 'system_prompt': version['system_prompt'],
                 'openai_model': version['openai_model'],
@@ -188,11 +213,16 @@ class AgentService:
             
             response = (self.supabase.table('agents')
                        .update(update_data)
-                       .eq('id', str(agent_id))
+                       .eq('slug', slug)
+                       .eq('id', version['agent_id'])
                        .execute())
             
+            if not response.data:
+                return None
             return Agent(**response.data[0])
         except Exception as e:
+            if "No rows found" in str(e):
+                return None
             logger.error(f"Error restoring agent version: {e}")
             raise
     